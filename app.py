@@ -22,6 +22,7 @@ from src.agents.brain import CerebroDeepSeek
 from src.tools.web_search import search_google
 from src.tools.web_crawler import extract_contacts
 from src.tools.username_check import search_username
+from src.tools.cnpj_db import lookup_cnpj
 from src.utils.detect_target_type import detect_target_type
 
 
@@ -76,7 +77,7 @@ with st.sidebar:
 
     st.markdown("---")
     if HAS_LOCAL_CNPJ:
-        st.success("Base local de CNPJ detectada (modo híbrido pronto, ainda não ativado).")
+        st.success("Base local de CNPJ detectada (consulta Receita ativa para alvos CNPJ).")
     else:
         st.info("Modo atual: OSINT online (sem base local de CNPJ).")
 
@@ -128,6 +129,23 @@ if start_btn and target:
             f"| Normalizado: **{target_info['clean']}**"
         )
 
+    # =========================================================
+    # FASE 0: CONSULTA RECEITA (base local, pool somente leitura)
+    # =========================================================
+    if HAS_LOCAL_CNPJ and target_info["type"] == "cnpj":
+        with st.expander("🏛️ Receita Federal (base local)", expanded=True):
+            receita = lookup_cnpj(target_info["clean"])
+            if receita.get("error"):
+                st.error(receita["error"])
+            elif not receita.get("empresa"):
+                st.warning("CNPJ não encontrado na base local.")
+            else:
+                st.json(receita["empresa"])
+                if receita.get("socios"):
+                    st.table(receita["socios"])
+            if not receita.get("error"):
+                collected_data.append({"type": "receita_cnpj", "data": receita})
+
     # Abas para organizar os resultados
     tab1, tab2, tab3, tab4 = st.tabs(
         ["🗺️ Planejamento", "🔎 Buscas & Social", "🕷️ Crawler", "📑 Dossiê Final"]
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concorrência da base local de CNPJ.
+
+Compara consultas/seg com N leitores em paralelo:
+  - naive: sqlite3.connect() padrão a cada consulta (como cada sessão faria sozinha)
+  - pool:  ReadOnlyPool compartilhado (mode=ro, mmap, cache ajustado)
+
+Uso:
+  python benchmarks/bench_cnpj_pool.py                      # gera base sintética
+  python benchmarks/bench_cnpj_pool.py --db data/cnpj.db    # usa a base real
+  python benchmarks/bench_cnpj_pool.py --readers 1 4 16 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.tools.cnpj_db import ReadOnlyPool, ensure_indexes, lookup_cnpj  # noqa: E402
+from src.tools.cnpj_loader import EMPRESAS_COLUMNS, SOCIOS_COLUMNS  # noqa: E402
+
+
+def build_synthetic_db(path: str, n_empresas: int) -> None:
+    print(f"[*] Gerando base sintética com {n_empresas} empresas em {path}...")
+    conn = sqlite3.connect(path)
+    for table, cols in (("empresas", EMPRESAS_COLUMNS), ("socios", SOCIOS_COLUMNS)):
+        cols_def = ", ".join(f'"{c}" TEXT' for c in cols)
+        conn.execute(f'CREATE TABLE "{table}" ({cols_def});')
+
+    empresas = (
+        (f"{i:08d}", f"EMPRESA {i} LTDA", "2062", "49", "1000,00", "01", "")
+        for i in range(n_empresas)
+    )
+    conn.executemany(f"INSERT INTO empresas VALUES ({','.join('?' * 7)});", empresas)
+
+    socios = (
+        (f"{i:08d}", "2", f"SOCIO {i}-{j}", "***123456**", "49", "20200101",
+         "", "", "", "00", "5")
+        for i in range(n_empresas)
+        for j in range(2)
+    )
+    conn.executemany(f"INSERT INTO socios VALUES ({','.join('?' * 11)});", socios)
+    conn.commit()
+    ensure_indexes(conn)
+    conn.close()
+
+
+def sample_cnpjs(db_path: str, n: int) -> List[str]:
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            'SELECT "CNPJ_BASICO" FROM empresas ORDER BY RANDOM() LIMIT ?;', (n,)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [r[0] + "000100" for r in rows]
+
+
+def naive_lookup(db_path: str) -> Callable[[str], None]:
+    def _run(cnpj: str) -> None:
+        conn = sqlite3.connect(db_path)
+        try:
+            basico = cnpj[:8]
+            conn.execute(
+                'SELECT * FROM "empresas" WHERE "CNPJ_BASICO" = ? LIMIT 1;', (basico,)
+            ).fetchone()
+            conn.execute(
+                'SELECT * FROM "socios" WHERE "CNPJ_BASICO" = ?;', (basico,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    return _run
+
+
+def pool_lookup(pool: ReadOnlyPool) -> Callable[[str], None]:
+    def _run(cnpj: str) -> None:
+        res = lookup_cnpj(cnpj, pool=pool)
+        if res.get("error"):
+            raise RuntimeError(res["error"])
+
+    return _run
+
+
+def run(fn: Callable[[str], None], cnpjs: List[str], readers: int, seconds: float) -> float:
+    counts = [0] * readers
+    stop = threading.Event()
+
+    def worker(idx: int) -> None:
+        rnd = random.Random(idx)
+        while not stop.is_set():
+            fn(rnd.choice(cnpjs))
+            counts[idx] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(readers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return sum(counts) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do pool de leitura do cnpj.db")
+    parser.add_argument("--db", help="Caminho do cnpj.db (default: base sintética temporária)")
+    parser.add_argument("--rows", type=int, default=200_000, help="Empresas na base sintética")
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duração de cada rodada")
+    args = parser.parse_args()
+
+    tmpdir = None
+    db_path = args.db
+    if not db_path:
+        tmpdir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmpdir.name, "cnpj_bench.db")
+        build_synthetic_db(db_path, args.rows)
+
+    cnpjs = sample_cnpjs(db_path, 10_000)
+    if not cnpjs:
+        print("[!] Nenhuma empresa encontrada na base.")
+        return
+
+    print(f"\n{'leitores':>8} | {'naive q/s':>12} | {'pool q/s':>12} | {'ganho':>6}")
+    print("-" * 48)
+    for n in args.readers:
+        pool = ReadOnlyPool(db_path=db_path, size=n)
+        try:
+            naive_qps = run(naive_lookup(db_path), cnpjs, n, args.seconds)
+            pool_qps = run(pool_lookup(pool), cnpjs, n, args.seconds)
+        finally:
+            pool.close()
+        ratio = pool_qps / naive_qps if naive_qps else 0.0
+        print(f"{n:>8} | {naive_qps:>12.0f} | {pool_qps:>12.0f} | {ratio:>5.1f}x")
+
+    if tmpdir:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
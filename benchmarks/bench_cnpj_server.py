@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do serviço HTTP de CNPJ (src/tools/cnpj_server.py).
+
+Dispara requisições numa taxa FIXA (open-loop) e reporta latência p50/p99.
+A latência é medida a partir do instante agendado de cada requisição, então
+atrasos de fila entram na conta (sem "coordinated omission").
+Cada worker mantém sua própria conexão keep-alive.
+
+Uso:
+  python benchmarks/bench_cnpj_server.py                         # sobe servidor + base sintética
+  python benchmarks/bench_cnpj_server.py --url http://127.0.0.1:8600 --db data/cnpj.db
+  python benchmarks/bench_cnpj_server.py --rate 2000 --seconds 10 --batch-size 50
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_cnpj_pool import build_synthetic_db, sample_cnpjs  # noqa: E402
+from src.tools.cnpj_server import serve  # noqa: E402
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_load(
+    host: str,
+    port: int,
+    cnpjs: List[str],
+    rate: float,
+    seconds: float,
+    workers: int,
+    batch_size: int,
+    revalidate: bool,
+) -> None:
+    local = threading.local()
+    latencies: List[float] = []
+    statuses: dict = {}
+    lock = threading.Lock()
+
+    def conn() -> http.client.HTTPConnection:
+        if not hasattr(local, "conn"):
+            local.conn = http.client.HTTPConnection(host, port, timeout=10)
+            local.etags = {}
+        return local.conn
+
+    def one(scheduled: float, seed: int) -> None:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        rnd = random.Random(seed)
+        c = conn()
+        headers = {}
+        if batch_size > 1:
+            body = json.dumps({"cnpjs": rnd.sample(cnpjs, min(batch_size, len(cnpjs)))})
+            method, path = "POST", "/cnpj/batch"
+            headers["Content-Type"] = "application/json"
+        else:
+            body = None
+            method, path = "GET", f"/cnpj/{rnd.choice(cnpjs)}"
+            if revalidate and path in local.etags:
+                headers["If-None-Match"] = local.etags[path]
+
+        try:
+            c.request(method, path, body=body, headers=headers)
+            resp = c.getresponse()
+            resp.read()
+            status = resp.status
+            if resp.getheader("ETag"):
+                local.etags[path] = resp.getheader("ETag")
+        except Exception:
+            # Conexão caiu: descarta e recria na próxima
+            c.close()
+            del local.conn
+            status = "erro"
+
+        elapsed = time.perf_counter() - scheduled
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    total = int(rate * seconds)
+    interval = 1.0 / rate
+    start = time.perf_counter() + 0.2
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for i in range(total):
+            pool.submit(one, start + i * interval, i)
+
+    wall = time.perf_counter() - start
+    ms = [v * 1000 for v in latencies]
+    print(f"\nRequisições: {len(ms)} em {wall:.2f}s (alvo {rate:.0f} req/s, obtido {len(ms) / wall:.0f} req/s)")
+    print(f"Status: {statuses}")
+    print(f"p50: {percentile(ms, 50):.2f} ms | p99: {percentile(ms, 99):.2f} ms | max: {max(ms or [0]):.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço HTTP de CNPJ")
+    parser.add_argument("--url", help="Servidor já rodando (default: sobe um local)")
+    parser.add_argument("--db", help="cnpj.db para amostrar CNPJs / servir (default: base sintética)")
+    parser.add_argument("--rows", type=int, default=200_000, help="Empresas na base sintética")
+    parser.add_argument("--rate", type=float, default=500.0, help="Requisições por segundo")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=32, help="Conexões keep-alive simultâneas")
+    parser.add_argument("--batch-size", type=int, default=1, help=">1 usa POST /cnpj/batch")
+    parser.add_argument("--revalidate", action="store_true", help="Envia If-None-Match (testa 304)")
+    args = parser.parse_args()
+
+    tmpdir: Optional[tempfile.TemporaryDirectory] = None
+    db_path = args.db
+    if not db_path:
+        tmpdir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmpdir.name, "cnpj_bench.db")
+        build_synthetic_db(db_path, args.rows)
+
+    cnpjs = sample_cnpjs(db_path, 10_000)
+
+    httpd = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        httpd = serve("127.0.0.1", 0, db_path, pool_size=args.workers)
+        host, port = httpd.server_address[:2]
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        print(f"[*] Servidor local em http://{host}:{port}")
+
+    try:
+        run_load(host, port, cnpjs, args.rate, args.seconds, args.workers, args.batch_size, args.revalidate)
+    finally:
+        if httpd:
+            httpd.shutdown()
+            httpd.server_close()
+            httpd.RequestHandlerClass.service.close()
+        if tmpdir:
+            tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline do pipeline completo (main.run_investigation).
+
+As chamadas externas (DeepSeek, SerpAPI, crawler, Sherlock) passam pelo
+record/replay de src/utils/replay.py:
+
+  1) Gravar as fixtures UMA vez (precisa de rede e das chaves no .env):
+       python benchmarks/bench_pipeline.py --record -t "exemplo.com" -t "joao.silva@gmail.com"
+
+  2) Rodar offline quantas vezes quiser:
+       python benchmarks/bench_pipeline.py -t "exemplo.com" -t "joao.silva@gmail.com" --runs 20
+       python benchmarks/bench_pipeline.py -t "exemplo.com" --latency "deepseek=1500,serpapi=400"
+
+Reporta, por fase: chamadas, tempo médio por execução, memória alocada
+(líquida) e pico (tracemalloc). "orquestração" = total - soma das fases.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+class PhaseRecorder:
+    """
+    Embrulha as funções de cada fase do pipeline e acumula tempo/memória.
+    """
+
+    def __init__(self, trace_alloc: bool) -> None:
+        self.trace_alloc = trace_alloc
+        self.stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "seconds": 0.0, "alloc": 0, "peak": 0}
+        )
+
+    def wrap(self, phase: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def _timed(*args, **kwargs):
+            if self.trace_alloc:
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                st = self.stats[phase]
+                st["calls"] += 1
+                st["seconds"] += elapsed
+                if self.trace_alloc:
+                    after, peak = tracemalloc.get_traced_memory()
+                    st["alloc"] += after - before
+                    st["peak"] = max(st["peak"], peak - before)
+
+        return _timed
+
+
+def _positive_int(value: str) -> int:
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"inteiro inválido: {value!r}")
+    if n < 1:
+        raise argparse.ArgumentTypeError("precisa ser >= 1")
+    return n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark offline do pipeline de investigação")
+    parser.add_argument("-t", "--target", action="append", required=True, help="Alvo (pode repetir)")
+    parser.add_argument("--runs", type=_positive_int, default=5, help="Execuções por alvo")
+    parser.add_argument("--fixtures", default=os.path.join("fixtures", "replay"), help="Pasta das fixtures")
+    parser.add_argument("--record", action="store_true", help="Grava fixtures usando as APIs reais")
+    parser.add_argument("--latency", default="0", help="Latência sintética (ver src/utils/replay.py)")
+    parser.add_argument("--local-cnpj", action="store_true", help="Inclui a Fase 0 (base local de CNPJ)")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Não mede alocações (menos overhead)")
+    args = parser.parse_args()
+
+    # Precisa estar no ambiente antes de criar o cérebro / chamar as tools
+    os.environ["MASHA_REPLAY_MODE"] = "record" if args.record else "replay"
+    os.environ["MASHA_REPLAY_DIR"] = args.fixtures
+    os.environ["MASHA_REPLAY_LATENCY"] = args.latency
+
+    import main as pipeline
+    from src.agents.brain import CerebroDeepSeek
+    from src.utils.replay import ReplayMissError
+
+    runs = 1 if args.record else args.runs
+    recorder = PhaseRecorder(trace_alloc=not args.no_tracemalloc)
+
+    bot = CerebroDeepSeek()
+    bot.plan = recorder.wrap("fase1_planejamento", bot.plan)
+    bot.filter_urls = recorder.wrap("fase3_filtro_urls", bot.filter_urls)
+    bot.analyze = recorder.wrap("fase4_dossie", bot.analyze)
+    pipeline.lookup_cnpj = recorder.wrap("fase0_receita", pipeline.lookup_cnpj)
+    pipeline.search_google = recorder.wrap("fase2_busca", pipeline.search_google)
+    pipeline.search_username = recorder.wrap("fase2.5_sherlock", pipeline.search_username)
+    pipeline.extract_contacts = recorder.wrap("fase3_crawler", pipeline.extract_contacts)
+
+    if recorder.trace_alloc:
+        tracemalloc.start()
+
+    totals: List[float] = []
+    errors = 0
+    for target in args.target:
+        for _ in range(runs):
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    dossier = pipeline.run_investigation(
+                        target=target,
+                        bot=bot,
+                        has_local_cnpj=args.local_cnpj,
+                        silent=True,
+                        json_output=False,
+                    )
+            except ReplayMissError as e:
+                # Sem a fixture a execução seria mais curta (e mais rápida):
+                # os números não valem, então o benchmark para aqui
+                if recorder.trace_alloc:
+                    tracemalloc.stop()
+                print(f"[!] Execução abortada ({target}): {e.args[0]}")
+                print("[i] Grave as fixtures de novo com --record para este alvo.")
+                sys.exit(1)
+            totals.append(time.perf_counter() - start)
+            if dossier.get("error"):
+                errors += 1
+                print(f"[!] {target}: {dossier.get('message')} {dossier.get('exception', '')}")
+
+    if recorder.trace_alloc:
+        tracemalloc.stop()
+
+    if args.record:
+        print(f"[✓] Fixtures gravadas em {args.fixtures}")
+
+    n = len(totals)
+    total_s = sum(totals)
+    phases_s = sum(st["seconds"] for st in recorder.stats.values())
+
+    print(f"\nExecuções: {n} ({len(args.target)} alvo(s) x {runs}) | erros: {errors} | latência: {args.latency}")
+    print(f"{'fase':<20} {'chamadas':>9} {'ms/exec':>10} {'ms/chamada':>11} {'alloc KiB':>10} {'pico KiB':>10}")
+    print("-" * 75)
+    for phase in sorted(recorder.stats):
+        st = recorder.stats[phase]
+        if recorder.trace_alloc:
+            mem = f"{st['alloc'] / 1024 / n:>10.1f} {st['peak'] / 1024:>10.1f}"
+        else:
+            mem = f"{'-':>10} {'-':>10}"
+        print(
+            f"{phase:<20} {st['calls'] / n:>9.1f} {st['seconds'] * 1000 / n:>10.2f} "
+            f"{st['seconds'] * 1000 / st['calls']:>11.2f} {mem}"
+        )
+    print(f"{'orquestração':<20} {'':>9} {(total_s - phases_s) * 1000 / n:>10.2f}")
+    print("-" * 75)
+    print(f"{'total':<20} {'':>9} {total_s * 1000 / n:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ from src.agents.brain import CerebroDeepSeek
 from src.tools.web_search import search_google
 from src.tools.web_crawler import extract_contacts
 from src.tools.username_check import search_username  # Sherlock
+from src.tools.cnpj_db import lookup_cnpj
+from src.utils.replay import replay_enabled
 
 
 BANNER = r"""
@@ -73,6 +75,24 @@ def parse_cli_args():
         action="store_true",
         help="Imprimir apenas o JSON final do dossiê no stdout",
     )
+    parser.add_argument(
+        "--batch",
+        metavar="ARQUIVO",
+        help="Modo lote: CSV/XLSX com CNPJs, enriquecidos só com a base local (sem IA/buscas)",
+    )
+    parser.add_argument(
+        "--batch-output",
+        help="Saída do modo lote (.csv ou .parquet). Padrão: logs/Masha_batch_<arquivo>.csv",
+    )
+    parser.add_argument(
+        "--cnpj-column",
+        help="Nome da coluna de CNPJ no arquivo do modo lote (padrão: detecta automaticamente)",
+    )
+    parser.add_argument(
+        "--cnpj-basico",
+        action="store_true",
+        help="Modo lote: aceita valores com até 8 dígitos como CNPJ básico (raiz)",
+    )
     return parser.parse_args()
 
 
@@ -105,18 +125,38 @@ def run_investigation(
             f"Valor normalizado: {clean_value}{Style.RESET_ALL}"
         )
 
-        # Info sobre base local de CNPJ
-        if has_local_cnpj:
-            print(
-                f"{Fore.CYAN}[i] Base local de CNPJ detectada. "
-                f"(Futuras versões usarão Data Lake para enriquecimento){Style.RESET_ALL}"
-            )
-        else:
+        if not has_local_cnpj:
             print(
                 f"{Fore.CYAN}[i] Base de CNPJ local não encontrada. "
                 f"Pulando Fase 0 (Consulta Receita).{Style.RESET_ALL}"
             )
 
+    # =========================================================
+    # FASE 0: CONSULTA RECEITA (base local cnpj.db)
+    # =========================================================
+    if has_local_cnpj and target_type == "cnpj":
+        if not silent:
+            print(f"\n{Fore.WHITE}--- FASE 0: Consulta Receita (base local) ---{Style.RESET_ALL}")
+
+        receita = lookup_cnpj(clean_value)
+
+        if receita.get("error"):
+            if not silent:
+                print(f"{Fore.RED}[!] {receita['error']}{Style.RESET_ALL}")
+        else:
+            if not silent:
+                empresa = receita.get("empresa") or {}
+                print(
+                    f"{Fore.GREEN}[+] Empresa: {empresa.get('RAZAO_SOCIAL', 'não encontrada')} | "
+                    f"Sócios: {len(receita.get('socios', []))}{Style.RESET_ALL}"
+                )
+            collected_data.append(
+                {
+                    "type": "receita_cnpj",
+                    "data": receita,
+                }
+            )
+
     # =========================================================
     # FASE 1: PLANEJAMENTO (Google Dorks)
     # =========================================================
@@ -182,7 +222,9 @@ def run_investigation(
                         f"'{query}'{Style.RESET_ALL}"
                     )
 
-        time.sleep(1)
+        # Respeita o rate limit da SerpAPI (em replay não há API do outro lado)
+        if not replay_enabled():
+            time.sleep(1)
 
     collected_data.append(
         {
@@ -479,6 +521,30 @@ def main():
     # Usa flag de config OU existência do arquivo local
     has_local_cnpj = HAS_LOCAL_CNPJ or os.path.exists("data/cnpj.db")
 
+    # -------------------------------------------
+    # MODO LOTE: só base local, sem DeepSeek/SerpAPI
+    # -------------------------------------------
+    if args.batch:
+        if not has_local_cnpj:
+            print(
+                f"{Fore.RED}[!] Modo lote exige a base local de CNPJ "
+                f"(data/cnpj.db).{Style.RESET_ALL}"
+            )
+            sys.exit(1)
+
+        from src.tools.cnpj_batch import run_batch
+
+        result = run_batch(
+            input_path=args.batch,
+            output_path=args.batch_output,
+            column=args.cnpj_column,
+            silent=args.silent,
+            accept_basico=args.cnpj_basico,
+        )
+        if result is None:
+            sys.exit(1)
+        return
+
     # Instancia o cérebro uma única vez
     bot = CerebroDeepSeek()
 
@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 from colorama import Fore, Style
 
 from src.utils.detect_target_type import detect_target_type
+from src.utils.replay import ReplayMissError, replay_call, replay_enabled
 
 load_dotenv()
 
@@ -28,6 +29,11 @@ class CerebroDeepSeek:
         model: Optional[str] = None,
     ) -> None:
         self.api_key = api_key or os.getenv("DEEPSEEK_API_KEY")
+
+        # Em replay (MASHA_REPLAY_MODE=replay) as respostas vêm das fixtures
+        if not self.api_key and replay_enabled():
+            self.api_key = "replay"
+
         if not self.api_key:
             print(f"{Fore.RED}[!] DEEPSEEK_API_KEY não encontrado no .env{Style.RESET_ALL}")
             raise RuntimeError("DEEPSEEK_API_KEY ausente. Configure no .env.")
@@ -55,16 +61,27 @@ class CerebroDeepSeek:
           - dict com o JSON parseado
           - OU dict de erro {"error": True, "message": "...", "raw_response": "..."}
         """
-        try:
+        request = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_instruction},
+                {"role": "user", "content": user_content},
+            ],
+            "temperature": temperature,
+        }
+
+        def _live() -> str:
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_instruction},
-                    {"role": "user", "content": user_content},
-                ],
-                temperature=temperature,
+                **request,
                 response_format={"type": "json_object"},
             )
+            return response.choices[0].message.content
+
+        try:
+            raw = replay_call("deepseek", request, _live)
+        except ReplayMissError:
+            # Fixture faltando no replay não é falha da API: aborta a execução
+            raise
         except Exception as e:
             print(f"{Fore.RED}[!] Erro na chamada DeepSeek: {e}{Style.RESET_ALL}")
             return {
@@ -73,7 +90,6 @@ class CerebroDeepSeek:
                 "exception": str(e),
             }
 
-        raw = response.choices[0].message.content
         try:
             return json.loads(raw)
         except json.JSONDecodeError as je:
@@ -321,7 +337,8 @@ Retorne APENAS um JSON:
           "collected": [
             {"type": "google_search", "data": [...]},
             {"type": "website_crawl", "data": {...}},
-            {"type": "social_profiles", "data": [...]}
+            {"type": "social_profiles", "data": [...]},
+            {"type": "receita_cnpj", "data": {...}}
           ]
         }
 
@@ -345,6 +362,7 @@ Você receberá um PACOTE com:
       • google_search: resultados de busca
       • website_crawl: páginas já "invadidas" pelo crawler (com emails, telefones, documentos)
       • social_profiles: contas encontradas por username (Instagram, GitHub, etc.)
+      • receita_cnpj: dados cadastrais oficiais da Receita Federal (empresa + sócios), da base local
 
 Sua tarefa:
   1) Ler tudo.
@@ -0,0 +1,342 @@
+import os
+import sqlite3
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+from colorama import Fore, Style, init
+
+from src.tools.cnpj_db import ReadOnlyPool, get_pool
+from src.tools.cnpj_loader import EMPRESAS_COLUMNS, PORTE_EMPRESA_DESC
+
+init(autoreset=True)
+
+
+# ============================================================
+#  LEITURA DO ARQUIVO DE ENTRADA
+# ============================================================
+
+# Separadores aceitos no arquivo de entrada (planilhas exportadas do Excel/LibreOffice)
+INPUT_SEPARATORS = [";", ",", "|", "\t"]
+
+# Prefixo das colunas acrescentadas pelo lote (chaves e dados da Receita),
+# para não colidir com as colunas da planilha (ex: "RAZAO_SOCIAL")
+OUTPUT_PREFIX = "RECEITA_"
+
+_CNPJ_WEIGHTS = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+
+
+def _cnpj_is_valid(digits: str) -> bool:
+    """
+    Confere os dois dígitos verificadores de um CNPJ com 14 dígitos.
+    """
+    if len(digits) != 14 or len(set(digits)) == 1:
+        return False
+    for pos in (12, 13):
+        weights = _CNPJ_WEIGHTS[13 - pos:]
+        rest = sum(int(d) * w for d, w in zip(digits[:pos], weights)) % 11
+        if int(digits[pos]) != (0 if rest < 2 else 11 - rest):
+            return False
+    return True
+
+
+def _normalize_cnpj(value, accept_basico: bool = False) -> str:
+    """
+    Limpa máscara e recompõe zeros à esquerda perdidos pela planilha.
+
+    - Exatamente 8 dígitos → CNPJ_BASICO.
+    - Senão, se o valor completado com zeros até 14 dígitos tem dígitos
+      verificadores válidos → CNPJ completo (ex: "191" → 00000000000191).
+    - Com `accept_basico`, até 8 dígitos também vira CNPJ_BASICO.
+    - Qualquer outra coisa é inválida ("").
+    """
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Célula numérica do Excel: 191.0 → "191"
+        value = int(value)
+    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    if not digits or len(digits) > 14:
+        return ""
+    if len(digits) == 8:
+        return digits
+    if _cnpj_is_valid(digits.zfill(14)):
+        return digits.zfill(14)
+    if accept_basico and len(digits) < 8:
+        return digits.zfill(8)
+    return ""
+
+
+def _detect_input_separator(path: str, encoding: str) -> Optional[str]:
+    """
+    Escolhe o separador entre INPUT_SEPARATORS olhando as primeiras linhas
+    (mesma ideia do _detect_separator do cnpj_loader).
+    Retorna None se nenhum aparece: arquivo de uma coluna só.
+    """
+    with open(path, "r", encoding=encoding, errors="ignore") as f:
+        lines = [l for l in f.read(64 * 1024).splitlines() if l.strip()][:20]
+
+    scores = {sep: sum(l.count(sep) for l in lines) for sep in INPUT_SEPARATORS}
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else None
+
+
+def _pick_cnpj_column(df: pd.DataFrame, column: Optional[str]) -> str:
+    if column:
+        if column not in df.columns:
+            raise ValueError(f"Coluna '{column}' não existe no arquivo.")
+        return column
+    for c in df.columns:
+        if "cnpj" in str(c).lower():
+            return c
+    return df.columns[0]
+
+
+def read_cnpj_file(
+    path: str,
+    column: Optional[str] = None,
+    accept_basico: bool = False,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Lê CSV/XLSX com uma coluna de CNPJs (tudo como texto, pra não perder zeros).
+    Retorna (DataFrame original intacto, chaves) — chaves tem o mesmo índice
+    e as colunas CNPJ e CNPJ_BASICO (CNPJ vazio = CNPJ inválido).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xls"):
+        df = pd.read_excel(path, dtype=str)
+    else:
+        encoding = "utf-8-sig"
+        sep = _detect_input_separator(path, encoding)
+        if sep is None:
+            # Uma coluna só: usa o "unit separator" (0x1F), que não aparece
+            # em lista de CNPJs, para a linha inteira virar um campo
+            df = pd.read_csv(path, dtype=str, encoding=encoding, sep="\x1f")
+        else:
+            df = pd.read_csv(path, dtype=str, encoding=encoding, sep=sep)
+
+    col = _pick_cnpj_column(df, column)
+    keys = pd.DataFrame(index=df.index)
+    keys["CNPJ"] = df[col].map(lambda v: _normalize_cnpj(v, accept_basico))
+    keys["CNPJ_BASICO"] = keys["CNPJ"].str[:8]
+    return df, keys
+
+
+# ============================================================
+#  ENRIQUECIMENTO (set-based: tabela temporária + JOIN)
+# ============================================================
+
+def _has_table(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def _first_row(table: str, column: str, value: str) -> str:
+    """
+    Condição de JOIN que casa só UMA linha de `table` por valor: o loader
+    sempre faz append, então importar o mesmo ZIP duas vezes duplica tudo.
+    """
+    return f'(SELECT MIN(rowid) FROM "{table}" WHERE "{column}" = {value})'
+
+
+def _build_enrich_sql(conn: sqlite3.Connection) -> str:
+    """
+    Monta um único SELECT: batch_input ⟕ empresas ⟕ contagem de sócios,
+    decodificando natureza/qualificação se as tabelas de domínio existirem.
+    Sempre uma linha de saída por CNPJ_BASICO, mesmo com linhas repetidas na base.
+    """
+    empresa_cols = ", ".join(f'e."{c}"' for c in EMPRESAS_COLUMNS if c != "CNPJ_BASICO")
+    select = ['b."CNPJ_BASICO"', '(e."CNPJ_BASICO" IS NOT NULL) AS ENCONTRADO', empresa_cols]
+    joins = [
+        'LEFT JOIN "empresas" e ON e.rowid = '
+        + _first_row("empresas", "CNPJ_BASICO", 'b."CNPJ_BASICO"')
+    ]
+
+    if _has_table(conn, "naturezas"):
+        select.append('n."DESCRICAO" AS NATUREZA_JURIDICA_DESC')
+        joins.append(
+            'LEFT JOIN "naturezas" n ON n.rowid = '
+            + _first_row("naturezas", "CODIGO", 'e."NATUREZA_JURIDICA"')
+        )
+
+    if _has_table(conn, "qualificacoes"):
+        select.append('q."DESCRICAO" AS QUALIF_RESPONSAVEL_DESC')
+        joins.append(
+            'LEFT JOIN "qualificacoes" q ON q.rowid = '
+            + _first_row("qualificacoes", "CODIGO", 'e."QUALIF_RESPONSAVEL"')
+        )
+
+    if _has_table(conn, "socios"):
+        # DISTINCT: sócio repetido por importação duplicada conta uma vez só
+        select.append("COALESCE(s.QTD_SOCIOS, 0) AS QTD_SOCIOS")
+        joins.append(
+            'LEFT JOIN (SELECT "CNPJ_BASICO", COUNT(*) AS QTD_SOCIOS FROM '
+            '(SELECT DISTINCT * FROM "socios" '
+            'WHERE "CNPJ_BASICO" IN (SELECT "CNPJ_BASICO" FROM temp.batch_input)) '
+            'GROUP BY "CNPJ_BASICO") s ON s."CNPJ_BASICO" = b."CNPJ_BASICO"'
+        )
+
+    return (
+        f"SELECT {', '.join(select)} FROM temp.batch_input b "
+        + " ".join(joins)
+        + ";"
+    )
+
+
+def enrich_cnpjs(basicos: List[str], pool: Optional[ReadOnlyPool] = None) -> pd.DataFrame:
+    """
+    Resolve uma lista de CNPJ_BASICO contra o cnpj.db em UMA consulta:
+    carrega os códigos numa tabela temporária e faz JOIN com empresas/sócios.
+    Retorna um DataFrame indexado por CNPJ_BASICO (um registro por empresa).
+    """
+    unique = sorted({b for b in basicos if b})
+    pool = pool or get_pool()
+
+    with pool.connection() as conn:
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS batch_input ("CNPJ_BASICO" TEXT PRIMARY KEY);')
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO temp.batch_input VALUES (?);",
+                ((b,) for b in unique),
+            )
+            cur = conn.execute(_build_enrich_sql(conn))
+            columns = [d[0] for d in cur.description]
+            result = pd.DataFrame([tuple(r) for r in cur.fetchall()], columns=columns)
+        finally:
+            conn.execute("DROP TABLE IF EXISTS temp.batch_input;")
+            conn.commit()
+
+    result["ENCONTRADO"] = result["ENCONTRADO"].astype(bool)
+    result["PORTE_EMPRESA_DESC"] = result["PORTE_EMPRESA"].map(PORTE_EMPRESA_DESC)
+    return result.set_index("CNPJ_BASICO")
+
+
+# ============================================================
+#  ESCRITA DA SAÍDA
+# ============================================================
+
+def _output_columns(existing: Iterable[str], names: Iterable[str]) -> List[str]:
+    """
+    OUTPUT_PREFIX + nome, com sufixo _2, _3... se a planilha já tiver
+    uma coluna com esse nome (as colunas originais nunca são alteradas).
+    """
+    taken = {str(c) for c in existing}
+    out = []
+    for name in names:
+        candidate = f"{OUTPUT_PREFIX}{name}"
+        n = 2
+        while candidate in taken:
+            candidate = f"{OUTPUT_PREFIX}{name}_{n}"
+            n += 1
+        taken.add(candidate)
+        out.append(candidate)
+    return out
+
+
+def merge_output(df: pd.DataFrame, keys: pd.DataFrame, enriched: pd.DataFrame) -> pd.DataFrame:
+    """
+    Planilha original + chaves + dados da Receita, lado a lado
+    (colunas acrescentadas com OUTPUT_PREFIX).
+    """
+    added = keys.join(enriched, on="CNPJ_BASICO")
+    added["ENCONTRADO"] = added["ENCONTRADO"].fillna(False).astype(bool)
+    if "QTD_SOCIOS" in added.columns:
+        added["QTD_SOCIOS"] = added["QTD_SOCIOS"].astype("Int64")
+    added.columns = _output_columns(df.columns, added.columns)
+    return pd.concat([df, added], axis=1)
+
+
+def _check_output_format(path: str) -> None:
+    """
+    Falha ANTES da consulta se o formato de saída não puder ser gravado
+    (Parquet usa o pyarrow do requirements.txt; fastparquet também serve).
+    """
+    if not path.lower().endswith(".parquet"):
+        return
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        try:
+            import fastparquet  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "saída .parquet exige pyarrow (pip install -r requirements.txt); use .csv"
+            ) from None
+
+
+def write_output(df: pd.DataFrame, path: str) -> None:
+    """
+    Grava CSV ou Parquet, conforme a extensão do arquivo de saída.
+    """
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    if path.lower().endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def run_batch(
+    input_path: str,
+    output_path: Optional[str] = None,
+    column: Optional[str] = None,
+    silent: bool = False,
+    accept_basico: bool = False,
+    pool: Optional[ReadOnlyPool] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Modo lote (somente base local, sem LLM nem buscas externas):
+    lê o arquivo de CNPJs, enriquece com a Receita e grava o resultado.
+    Retorna None se qualquer etapa falhar (inclusive a gravação da saída).
+    """
+    start = time.perf_counter()
+
+    if not output_path:
+        base = os.path.splitext(os.path.basename(input_path))[0]
+        output_path = os.path.join("logs", f"Masha_batch_{base}.csv")
+
+    try:
+        _check_output_format(output_path)
+    except ImportError as e:
+        print(f"{Fore.RED}[!] Formato de saída indisponível: {e}{Style.RESET_ALL}")
+        return None
+
+    try:
+        df, keys = read_cnpj_file(input_path, column, accept_basico)
+    except Exception as e:
+        print(f"{Fore.RED}[!] Falha ao ler {input_path}: {e}{Style.RESET_ALL}")
+        return None
+
+    invalid = int((keys["CNPJ"] == "").sum())
+    if not silent:
+        print(
+            f"{Fore.CYAN}[i] Linhas lidas: {len(df)} | "
+            f"CNPJs inválidos: {invalid}{Style.RESET_ALL}"
+        )
+
+    try:
+        enriched = enrich_cnpjs(keys["CNPJ_BASICO"].tolist(), pool=pool)
+        result = merge_output(df, keys, enriched)
+    except Exception as e:
+        print(f"{Fore.RED}[!] Falha na consulta à base local de CNPJ: {e}{Style.RESET_ALL}")
+        return None
+
+    try:
+        write_output(result, output_path)
+    except Exception as e:
+        print(f"{Fore.RED}[!] Falha ao salvar {output_path}: {e}{Style.RESET_ALL}")
+        return None
+
+    if not silent:
+        found = int(keys["CNPJ_BASICO"].isin(enriched.index[enriched["ENCONTRADO"]]).sum())
+        elapsed = time.perf_counter() - start
+        print(
+            f"{Fore.GREEN}[✓] {found}/{len(result)} CNPJs encontrados na base local "
+            f"em {elapsed:.2f}s -> {output_path}{Style.RESET_ALL}"
+        )
+
+    return result
@@ -0,0 +1,293 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.config.masha_config import CNPJ_DB_PATH
+
+# ============================================================
+#  CONFIGURAÇÃO DO POOL (pode ser ajustada via .env)
+# ============================================================
+
+# Nº máximo de conexões abertas ao mesmo tempo (uma por leitor ativo)
+POOL_SIZE = int(os.getenv("MASHA_CNPJ_POOL_SIZE", "8"))
+
+# mmap: deixa o SO mapear o arquivo direto na memória e compartilhar
+# as páginas entre todas as conexões/processos (default: 1 GB)
+MMAP_SIZE = int(os.getenv("MASHA_CNPJ_MMAP_SIZE", str(1024 * 1024 * 1024)))
+
+# cache_size negativo = KiB por conexão (default: 16 MB)
+CACHE_SIZE_KIB = int(os.getenv("MASHA_CNPJ_CACHE_KIB", "16000"))
+
+# immutable=1: o SQLite não checa locks nem mudanças no arquivo.
+# Só é seguro quando NENHUM processo está importando dados no banco.
+IMMUTABLE = os.getenv("MASHA_CNPJ_IMMUTABLE", "false").lower() == "true"
+
+
+# ============================================================
+#  CONEXÕES
+# ============================================================
+
+def _readonly_uri(db_path: str, immutable: bool = IMMUTABLE) -> str:
+    uri = f"file:{os.path.abspath(db_path)}?mode=ro"
+    if immutable:
+        uri += "&immutable=1"
+    return uri
+
+
+def open_readonly_connection(
+    db_path: str = str(CNPJ_DB_PATH),
+    immutable: bool = IMMUTABLE,
+) -> sqlite3.Connection:
+    """
+    Abre uma conexão SOMENTE LEITURA, já com mmap e cache ajustados.
+    Levanta sqlite3.OperationalError se o arquivo não existir.
+    """
+    conn = sqlite3.connect(
+        _readonly_uri(db_path, immutable),
+        uri=True,
+        check_same_thread=False,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE};")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB};")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    return conn
+
+
+def open_write_connection(db_path: str = str(CNPJ_DB_PATH)) -> sqlite3.Connection:
+    """
+    Conexão de escrita (usada pelo cnpj_loader).
+    WAL permite que os leitores do pool continuem consultando
+    enquanto uma importação está em andamento.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE};")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB};")
+    return conn
+
+
+def ensure_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Cria os índices por CNPJ_BASICO usados nas consultas.
+    Sem eles cada lookup vira um full scan de milhões de linhas.
+    """
+    for table in ("empresas", "socios"):
+        if not _table_has_column(conn, table, "CNPJ_BASICO"):
+            continue
+        conn.execute(
+            f'CREATE INDEX IF NOT EXISTS "idx_{table}_cnpj_basico" '
+            f'ON "{table}" ("CNPJ_BASICO");'
+        )
+    conn.commit()
+
+
+def _table_has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    rows = conn.execute(f'PRAGMA table_info("{table}");').fetchall()
+    return any(r[1] == column for r in rows)
+
+
+# ============================================================
+#  POOL COMPARTILHADO
+# ============================================================
+
+class ReadOnlyPool:
+    """
+    Pool thread-safe de conexões somente leitura ao cnpj.db.
+
+    As conexões são criadas sob demanda até `size` e reaproveitadas;
+    com mmap, todas compartilham as mesmas páginas do arquivo em RAM.
+
+    Uso:
+        with pool.connection() as conn:
+            conn.execute("SELECT ...")
+    """
+
+    def __init__(
+        self,
+        db_path: str = str(CNPJ_DB_PATH),
+        size: int = POOL_SIZE,
+        immutable: bool = IMMUTABLE,
+        timeout: float = 30.0,
+    ) -> None:
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.immutable = immutable
+        self.timeout = timeout
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("Pool de conexões CNPJ já foi fechado.")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                conn = open_readonly_connection(self.db_path, self.immutable)
+                self._created += 1
+                return conn
+
+        # Pool cheio: espera alguém devolver
+        return self._idle.get(timeout=self.timeout)
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_POOL: Optional[ReadOnlyPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> ReadOnlyPool:
+    """
+    Retorna o pool global (um por processo). No Streamlit todas as
+    sessões compartilham o mesmo pool, já que o módulo é importado uma vez.
+    """
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ReadOnlyPool()
+    return _POOL
+
+
+# ============================================================
+#  CONSULTAS
+# ============================================================
+
+def _only_digits(s: str) -> str:
+    return "".join(ch for ch in s if ch.isdigit())
+
+
+def lookup_cnpj(cnpj: str, pool: Optional[ReadOnlyPool] = None) -> Dict[str, Any]:
+    """
+    Consulta empresa + quadro societário na base local pelo CNPJ
+    (com ou sem máscara). A busca é feita pelo CNPJ_BASICO (8 primeiros dígitos).
+
+    Retorno:
+      {
+        "cnpj_basico": "12345678",
+        "empresa": {...} | None,
+        "socios": [{...}, ...]
+      }
+      OU {"error": "..."} em caso de falha.
+    """
+    digits = _only_digits(cnpj)
+    if len(digits) < 8:
+        return {"error": f"CNPJ inválido: {cnpj}"}
+
+    basico = digits[:8]
+    pool = pool or get_pool()
+
+    try:
+        with pool.connection() as conn:
+            empresa = conn.execute(
+                'SELECT * FROM "empresas" WHERE "CNPJ_BASICO" = ? LIMIT 1;',
+                (basico,),
+            ).fetchone()
+            # DISTINCT: importar o mesmo ZIP duas vezes duplica as linhas (append)
+            socios: List[sqlite3.Row] = conn.execute(
+                'SELECT DISTINCT * FROM "socios" WHERE "CNPJ_BASICO" = ?;',
+                (basico,),
+            ).fetchall()
+    except Exception as e:
+        return {"error": f"Falha na consulta à base local de CNPJ: {e}"}
+
+    return {
+        "cnpj_basico": basico,
+        "empresa": dict(empresa) if empresa else None,
+        "socios": [dict(s) for s in socios],
+    }
+
+
+def lookup_cnpjs(cnpjs: List[str], pool: Optional[ReadOnlyPool] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Versão em lote do lookup_cnpj: carrega os CNPJ_BASICO numa tabela
+    temporária e resolve empresas + sócios com dois JOINs (não uma query por item).
+
+    Retorno: {cnpj_basico: {"cnpj_basico", "empresa", "socios"}} para cada
+    CNPJ válido recebido (empresa=None quando não encontrado).
+    Levanta a exceção do SQLite em caso de falha (quem chama trata).
+
+    CROSS JOIN fixa a ordem: sem estatísticas da tabela temporária o
+    planner prefere varrer empresas/sócios inteiros em vez de usar o índice.
+    """
+    basicos = sorted({d[:8] for d in (_only_digits(c) for c in cnpjs) if len(d) >= 8})
+    results: Dict[str, Dict[str, Any]] = {
+        b: {"cnpj_basico": b, "empresa": None, "socios": []} for b in basicos
+    }
+    if not basicos:
+        return results
+
+    pool = pool or get_pool()
+
+    with pool.connection() as conn:
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS lookup_input ("CNPJ_BASICO" TEXT PRIMARY KEY);')
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO temp.lookup_input VALUES (?);",
+                ((b,) for b in basicos),
+            )
+            # Linhas repetidas (importação duplicada): uma empresa por
+            # CNPJ_BASICO, como o LIMIT 1 do lookup_cnpj, e sócios sem repetição
+            for row in conn.execute(
+                'SELECT e.* FROM temp.lookup_input i '
+                'CROSS JOIN "empresas" e ON e.rowid = ('
+                'SELECT MIN(rowid) FROM "empresas" WHERE "CNPJ_BASICO" = i."CNPJ_BASICO");'
+            ):
+                results[row["CNPJ_BASICO"]]["empresa"] = dict(row)
+            for row in conn.execute(
+                'SELECT DISTINCT s.* FROM temp.lookup_input i '
+                'CROSS JOIN "socios" s ON s."CNPJ_BASICO" = i."CNPJ_BASICO";'
+            ):
+                results[row["CNPJ_BASICO"]]["socios"].append(dict(row))
+        finally:
+            conn.execute("DROP TABLE IF EXISTS temp.lookup_input;")
+            conn.commit()
+
+    return results
+
+
+def release_id(db_path: str = str(CNPJ_DB_PATH)) -> str:
+    """
+    Identificador da "release" carregada no cnpj.db (muda a cada importação).
+    Usado como base das ETags do serviço HTTP.
+    """
+    parts = []
+    # Em WAL as escritas ficam no -wal até o checkpoint, então entra na conta
+    for path in (db_path, db_path + "-wal"):
+        if os.path.exists(path):
+            st = os.stat(path)
+            parts.append(f"{st.st_size:x}-{st.st_mtime_ns:x}")
+    return ".".join(parts)
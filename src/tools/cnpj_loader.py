@@ -1,5 +1,6 @@
 import os
 import re
+import time
 import zipfile
 import sqlite3
 from typing import List, Optional
@@ -7,6 +8,9 @@ from typing import List, Optional
 import pandas as pd
 from colorama import Fore, Style, init
 
+from src.tools.cnpj_db import ensure_indexes, open_write_connection
+from src.utils.progress import ImportProgress
+
 # ============================================================
 #  CONFIGURAÇÃO BÁSICA
 # ============================================================
@@ -17,6 +21,9 @@ DOWNLOAD_DIR = "downloads"
 DATA_DIR = "data"
 DB_PATH = os.path.join(DATA_DIR, "cnpj.db")
 
+# Eventos de progresso da importação (JSONL, um evento por linha)
+PROGRESS_LOG = os.getenv("MASHA_IMPORT_LOG", os.path.join("logs", "cnpj_import.jsonl"))
+
 
 # ============================================================
 #  LAYOUTS OFICIAIS (RESUMIDOS) – Receita Federal
@@ -47,6 +54,36 @@ SOCIOS_COLUMNS = [
     "FAIXA_ETARIA"
 ]
 
+# Tabelas de domínio (Naturezas.zip, Qualificacoes.zip, Cnaes.zip...): código -> descrição
+CODIGOS_COLUMNS = [
+    "CODIGO",
+    "DESCRICAO"
+]
+
+# Sufixo do arquivo interno oficial da Receita (sem extensão) -> tabela.
+# Cada um vira sua própria tabela: vários ZIPs de domínio usam o MESMO
+# prefixo (ex: F.K03200$Z.D40308.CNAECSV / F.K03200$Z.D40308.MUNICCSV).
+RECEITA_MEMBER_TABLES = {
+    "emprecsv": "empresas",
+    "sociocsv": "socios",
+    "natjucsv": "naturezas",
+    "qualscsv": "qualificacoes",
+    "cnaecsv": "cnaes",
+    "municcsv": "municipios",
+    "paiscsv": "paises",
+    "moticsv": "motivos",
+}
+
+CODIGOS_TABLES = ("naturezas", "qualificacoes", "cnaes", "municipios", "paises", "motivos")
+
+# Porte da empresa não tem tabela própria na Receita: vem só no layout
+PORTE_EMPRESA_DESC = {
+    "00": "NÃO INFORMADO",
+    "01": "MICRO EMPRESA",
+    "03": "EMPRESA DE PEQUENO PORTE",
+    "05": "DEMAIS",
+}
+
 
 # ============================================================
 #  FUNÇÕES AUXILIARES
@@ -59,19 +96,32 @@ def _ensure_dirs() -> None:
 
 def _detect_table_type(filename: str) -> str:
     """
-    Decide o tipo de tabela com base no nome do arquivo:
-    - 'empresas'
-    - 'socios'
+    Decide o tipo de tabela com base no nome do arquivo
+    (nome amigável ou sufixo oficial da Receita, ex: *.EMPRECSV):
+    - 'empresas' / 'socios'
+    - tabelas de domínio: 'naturezas', 'qualificacoes', 'cnaes', ...
     - 'raw' (desconhecido)
     """
     name_lower = filename.lower()
-    if "empresas" in name_lower:
-        return "empresas"
-    if "socios" in name_lower or "sócios" in name_lower:
+    if "sócios" in name_lower:
         return "socios"
+    for suffix, table in RECEITA_MEMBER_TABLES.items():
+        if name_lower.endswith(suffix) or table in name_lower:
+            return table
     return "raw"
 
 
+def _is_importable_member(member: str) -> bool:
+    """
+    Arquivos internos do ZIP que sabemos carregar:
+    .csv/.txt ou um dos sufixos oficiais da Receita (RECEITA_MEMBER_TABLES).
+    """
+    name_lower = member.lower()
+    if name_lower.endswith((".csv", ".txt")):
+        return True
+    return name_lower.endswith(tuple(RECEITA_MEMBER_TABLES))
+
+
 def _detect_separator(sample: str) -> str:
     """
     Detecta o separador mais provável entre | ; ,
@@ -118,6 +168,9 @@ def _infer_columns(table_type: str, n_cols: int) -> List[str]:
     if table_type == "socios" and n_cols == len(SOCIOS_COLUMNS):
         return SOCIOS_COLUMNS
 
+    if table_type in CODIGOS_TABLES and n_cols == len(CODIGOS_COLUMNS):
+        return CODIGOS_COLUMNS
+
     # Fallback: col_1, col_2, ...
     return [f"col_{i+1}" for i in range(n_cols)]
 
@@ -130,11 +183,13 @@ def _load_csv_into_db(
     conn: sqlite3.Connection,
     fileobj,
     table_name: str,
-    encoding: str = "latin-1"
+    encoding: str = "latin-1",
+    progress: Optional[ImportProgress] = None
 ) -> None:
     """
     Lê um arquivo CSV/TXT (fileobj vindo do ZipFile.open) em chunks
     e grava no SQLite, usando inferência de separador e schema resiliente.
+    Se `progress` vier, reporta bytes/linhas/ritmo a cada chunk.
     """
     # Lê uma amostra pra detectar separador e número de colunas
     sample_bytes = fileobj.read(1024 * 64)  # 64 KB
@@ -157,6 +212,8 @@ def _load_csv_into_db(
         )
     except Exception as e:
         print(f"{Fore.RED}[!] Falha ao ler amostra do arquivo: {e}{Style.RESET_ALL}")
+        if progress:
+            progress.close(error=f"amostra: {e}")
         return
 
     n_cols = sample_df.shape[1]
@@ -166,7 +223,11 @@ def _load_csv_into_db(
     table_type = _detect_table_type(table_name)
     columns = _infer_columns(table_type, n_cols)
 
-    print(f"{Fore.CYAN}[i] Tabela: {table_name} | Tipo inferido: {table_type} | Colunas: {n_cols} | Sep: '{sep}'{Style.RESET_ALL}")
+    info = f"{Fore.CYAN}[i] Tabela: {table_name} | Tipo inferido: {table_type} | Colunas: {n_cols} | Sep: '{sep}'{Style.RESET_ALL}"
+    if progress:
+        progress.write(info)
+    else:
+        print(info)
 
     _create_table_if_not_exists(conn, table_name, columns)
 
@@ -175,7 +236,7 @@ def _load_csv_into_db(
     total_rows = 0
 
     try:
-        for chunk in pd.read_csv(
+        reader = pd.read_csv(
             fileobj,
             sep=sep,
             header=None,
@@ -183,7 +244,12 @@ def _load_csv_into_db(
             encoding=encoding,
             engine="python",
             chunksize=chunksize
-        ):
+        )
+        t_parse = time.perf_counter()
+        for chunk in reader:
+            parse_s = time.perf_counter() - t_parse
+            rows_parsed = len(chunk)
+
             # Garante número de colunas igual
             if chunk.shape[1] != len(columns):
                 # Ajusta ou corta, se vier com mais/menos colunas
@@ -196,28 +262,49 @@ def _load_csv_into_db(
 
             chunk.columns = columns
 
-            chunk.to_sql(
+            t_write = time.perf_counter()
+            # pandas >= 2 devolve o nº de linhas que o SQLite de fato inseriu
+            written = chunk.to_sql(
                 table_name,
                 conn,
                 if_exists="append",
                 index=False
             )
-            total_rows += len(chunk)
+            write_s = time.perf_counter() - t_write
+            if written is None:
+                written = len(chunk)
+            total_rows += written
+
+            if progress:
+                # tell() do ZipExtFile = posição no conteúdo DEScompactado
+                progress.chunk(rows_parsed, written, fileobj.tell(), parse_s, write_s)
+            else:
+                print(f"{Fore.GREEN}    [+] Inseridas {written} linhas (total: {total_rows}){Style.RESET_ALL}")
 
-            print(f"{Fore.GREEN}    [+] Inseridas {len(chunk)} linhas (total: {total_rows}){Style.RESET_ALL}")
+            t_parse = time.perf_counter()
 
     except Exception as e:
         print(f"{Fore.RED}[!] Erro ao carregar CSV em chunks: {e}{Style.RESET_ALL}")
+        if progress:
+            progress.close(error=str(e))
         return
 
+    if progress:
+        progress.close()
     print(f"{Fore.GREEN}[✓] Importação concluída para {table_name}. Linhas totais: {total_rows}{Style.RESET_ALL}")
 
 
-def process_zip_file(zip_path: str, conn: sqlite3.Connection) -> None:
+def process_zip_file(
+    zip_path: str,
+    conn: sqlite3.Connection,
+    progress_log: Optional[str] = PROGRESS_LOG,
+    show_bar: bool = True
+) -> None:
     """
     Processa um .zip da Receita:
     - Identifica arquivos internos .csv/.txt
     - Para cada um, carrega no SQLite
+    - Emite progresso (barra tqdm + eventos JSONL em `progress_log`)
     """
     print(f"\n{Fore.MAGENTA}=== Processando ZIP: {zip_path} ==={Style.RESET_ALL}")
 
@@ -229,10 +316,10 @@ def process_zip_file(zip_path: str, conn: sqlite3.Connection) -> None:
         with zipfile.ZipFile(zip_path, "r") as zf:
             members = _open_zip_members(zip_path)
 
-            csv_like = [m for m in members if m.lower().endswith((".csv", ".txt"))]
+            csv_like = [m for m in members if _is_importable_member(m)]
 
             if not csv_like:
-                print(f"{Fore.YELLOW}[!] Nenhum .csv ou .txt encontrado dentro do ZIP.{Style.RESET_ALL}")
+                print(f"{Fore.YELLOW}[!] Nenhum .csv, .txt ou arquivo oficial da Receita (*CSV) encontrado dentro do ZIP.{Style.RESET_ALL}")
                 return
 
             for member in csv_like:
@@ -247,7 +334,19 @@ def process_zip_file(zip_path: str, conn: sqlite3.Connection) -> None:
                         base = re.sub(r"[^a-zA-Z0-9_]", "_", base)
                         table_name = base.lower()
 
-                    _load_csv_into_db(conn, fobj, table_name)
+                    progress = ImportProgress(
+                        progress_log,
+                        zip_path,
+                        member,
+                        table_name,
+                        bytes_total=zf.getinfo(member).file_size,
+                        show_bar=show_bar,
+                    )
+                    try:
+                        _load_csv_into_db(conn, fobj, table_name, progress=progress)
+                    except Exception as e:
+                        progress.close(error=str(e))
+                        raise
 
     except Exception as e:
         print(f"{Fore.RED}[!] Erro ao processar ZIP {zip_path}: {e}{Style.RESET_ALL}")
@@ -294,8 +393,8 @@ def interface_cli() -> None:
         print(f"{Fore.YELLOW}[i] Operação cancelada pelo usuário.{Style.RESET_ALL}")
         return
 
-    # Abre conexão com SQLite
-    conn = sqlite3.connect(DB_PATH)
+    # Abre conexão com SQLite (WAL: leitores continuam consultando durante a carga)
+    conn = open_write_connection(DB_PATH)
 
     try:
         if escolha == "todos":
@@ -303,6 +402,7 @@ def interface_cli() -> None:
             for z in all_zips:
                 zip_full_path = os.path.join(DOWNLOAD_DIR, z)
                 process_zip_file(zip_full_path, conn)
+            ensure_indexes(conn)
             print(f"{Fore.GREEN}[✓] Importação de todos os arquivos concluída.{Style.RESET_ALL}")
             return
 
@@ -312,6 +412,7 @@ def interface_cli() -> None:
                 selected = all_zips[idx]
                 zip_full_path = os.path.join(DOWNLOAD_DIR, selected)
                 process_zip_file(zip_full_path, conn)
+                ensure_indexes(conn)
                 print(f"{Fore.GREEN}[✓] Importação concluída para {selected}.{Style.RESET_ALL}")
                 return
             else:
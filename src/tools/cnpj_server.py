@@ -0,0 +1,321 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from colorama import Fore, Style, init
+
+from src.config.masha_config import CNPJ_DB_PATH
+from src.tools.cnpj_db import POOL_SIZE, ReadOnlyPool, lookup_cnpjs, release_id
+
+init(autoreset=True)
+
+# ============================================================
+#  CONFIGURAÇÃO
+# ============================================================
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.getenv("MASHA_CNPJ_API_PORT", "8600"))
+
+# Nº máximo de CNPJs por requisição no /cnpj/batch
+MAX_BATCH = 1000
+
+# Nº de empresas mantidas no cache de respostas (LRU)
+CACHE_ENTRIES = int(os.getenv("MASHA_CNPJ_API_CACHE", "50000"))
+
+
+# ============================================================
+#  CACHE LRU AMARRADO À RELEASE
+# ============================================================
+
+class ReleaseCache:
+    """
+    Cache LRU de resultados por CNPJ_BASICO.
+    Quando a release do cnpj.db muda (nova importação), tudo é descartado.
+    """
+
+    def __init__(self, max_entries: int = CACHE_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.release = ""
+        self._data: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def sync_release(self, release: str) -> None:
+        with self._lock:
+            if release != self.release:
+                self._data.clear()
+                self.release = release
+
+    def get_many(self, keys: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        hits: Dict[str, Dict[str, Any]] = {}
+        misses: List[str] = []
+        with self._lock:
+            for k in keys:
+                if k in self._data:
+                    self._data.move_to_end(k)
+                    hits[k] = self._data[k]
+                else:
+                    misses.append(k)
+        return hits, misses
+
+    def put_many(self, release: str, items: Dict[str, Dict[str, Any]]) -> None:
+        """
+        `release` é a release em que os itens foram lidos. Se ela mudou
+        durante a consulta, os itens são de uma base antiga e não entram.
+        """
+        with self._lock:
+            if release != self.release:
+                return
+            for k, v in items.items():
+                self._data[k] = v
+                self._data.move_to_end(k)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+# ============================================================
+#  SERVIÇO
+# ============================================================
+
+class CNPJService:
+    """
+    Camada entre o HTTP e o banco: valida entrada, usa o cache
+    e só vai ao pool para os CNPJs que faltam.
+    """
+
+    def __init__(self, db_path: str = str(CNPJ_DB_PATH), pool_size: int = POOL_SIZE) -> None:
+        self.db_path = db_path
+        self.pool = ReadOnlyPool(db_path=db_path, size=pool_size)
+        self.cache = ReleaseCache()
+
+    def current_release(self) -> str:
+        release = release_id(self.db_path)
+        self.cache.sync_release(release)
+        return release
+
+    def resolve(self, release: str, basicos: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        `release` vem de current_release() no início da requisição.
+        """
+        hits, misses = self.cache.get_many(basicos)
+        if misses:
+            fresh = lookup_cnpjs(misses, pool=self.pool)
+            self.cache.put_many(release, fresh)
+            hits.update(fresh)
+        return hits
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+def _basico(cnpj: str) -> Optional[str]:
+    digits = "".join(ch for ch in cnpj if ch.isdigit())
+    if len(digits) not in (8, 14):
+        return None
+    return digits[:8]
+
+
+def _etag(release: str, keys: List[str]) -> str:
+    h = hashlib.sha1(release.encode())
+    for k in keys:
+        h.update(k.encode() + b"\0")
+    return f'"{h.hexdigest()}"'
+
+
+class CNPJRequestHandler(BaseHTTPRequestHandler):
+    """
+    Endpoints:
+      GET  /health               → status + release carregada
+      GET  /cnpj/<cnpj>          → empresa + sócios
+      POST /cnpj/batch           → {"cnpjs": ["...", ...]} (até MAX_BATCH)
+
+    HTTP/1.1 com keep-alive; respostas com ETag (If-None-Match → 304).
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Cabeçalho e corpo saem em writes separados: sem TCP_NODELAY o
+    # keep-alive esbarra no delayed ACK (~40 ms por resposta)
+    disable_nagle_algorithm = True
+    server_version = "MashaCNPJ/1.0"
+    service: CNPJService = None  # injetado em serve()
+
+    # ---------------------- utilitários ----------------------
+    def _send_json(self, status: int, payload: Any, etag: Optional[str] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, etag: str) -> bool:
+        if self.headers.get("If-None-Match") != etag:
+            return False
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def _read_body(self) -> Optional[bytes]:
+        """
+        Consome o corpo inteiro (Content-Length) ANTES de qualquer resposta,
+        senão os bytes que sobram no socket viram a "próxima requisição"
+        do keep-alive. Sem tamanho confiável, marca a conexão para fechar.
+        """
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or self.headers.get("Transfer-Encoding"):
+            self.close_connection = True
+            return None
+        return self.rfile.read(length) if length else b""
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Sem log por requisição (atrapalha o throughput e o terminal)
+        pass
+
+    # ------------------------- rotas -------------------------
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path.rstrip("/")
+
+        if path == "/health":
+            self._send_json(200, {"status": "ok", "release": self.service.current_release()})
+            return
+
+        if path.startswith("/cnpj/") and path != "/cnpj/batch":
+            cnpj = path[len("/cnpj/"):]
+            basico = _basico(cnpj)
+            if not basico:
+                self._send_json(400, {"error": f"CNPJ inválido: {cnpj}"})
+                return
+
+            release = self.service.current_release()
+            etag = _etag(release, [basico])
+            if self._not_modified(etag):
+                return
+
+            try:
+                result = self.service.resolve(release, [basico])[basico]
+            except Exception as e:
+                self._send_json(500, {"error": f"Falha na consulta à base local de CNPJ: {e}"})
+                return
+
+            status = 200 if result.get("empresa") else 404
+            self._send_json(status, result, etag if status == 200 else None)
+            return
+
+        self._send_json(404, {"error": "Rota não encontrada."})
+
+    def do_POST(self) -> None:
+        raw = self._read_body()
+        if raw is None:
+            self._send_json(411, {"error": "Content-Length ausente ou inválido."})
+            return
+
+        path = urlsplit(self.path).path.rstrip("/")
+        if path != "/cnpj/batch":
+            self._send_json(404, {"error": "Rota não encontrada."})
+            return
+
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "JSON inválido."})
+            return
+
+        cnpjs = body.get("cnpjs") if isinstance(body, dict) else None
+        if not isinstance(cnpjs, list) or not cnpjs:
+            self._send_json(400, {"error": "Envie {\"cnpjs\": [\"...\"]}."})
+            return
+        if len(cnpjs) > MAX_BATCH:
+            self._send_json(413, {"error": f"Máximo de {MAX_BATCH} CNPJs por requisição."})
+            return
+
+        inputs = [str(c) for c in cnpjs]
+        basicos = {c: _basico(c) for c in inputs}
+        valid = sorted({b for b in basicos.values() if b})
+
+        release = self.service.current_release()
+        # A resposta é indexada pelos CNPJs como enviados, então a ETag também
+        etag = _etag(release, ["batch"] + inputs)
+        if self._not_modified(etag):
+            return
+
+        try:
+            resolved = self.service.resolve(release, valid)
+        except Exception as e:
+            self._send_json(500, {"error": f"Falha na consulta à base local de CNPJ: {e}"})
+            return
+
+        results = {
+            c: resolved[b] if b else {"error": f"CNPJ inválido: {c}"}
+            for c, b in basicos.items()
+        }
+        self._send_json(200, {"release": release, "results": results}, etag)
+
+
+# ============================================================
+#  INTERFACE CLI
+# ============================================================
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    db_path: str = str(CNPJ_DB_PATH),
+    pool_size: int = POOL_SIZE,
+) -> ThreadingHTTPServer:
+    """
+    Cria o servidor (sem iniciar o loop). Útil para testes/benchmarks.
+    """
+    if not os.path.isfile(db_path):
+        raise FileNotFoundError(f"Base de CNPJ não encontrada: {db_path}")
+
+    service = CNPJService(db_path=db_path, pool_size=pool_size)
+    handler = type("BoundCNPJRequestHandler", (CNPJRequestHandler,), {"service": service})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    return httpd
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Masha – serviço HTTP local de consulta CNPJ")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default=str(CNPJ_DB_PATH), help="Caminho do cnpj.db")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE)
+    args = parser.parse_args()
+
+    try:
+        httpd = serve(args.host, args.port, args.db, args.pool_size)
+    except Exception as e:
+        print(f"{Fore.RED}[!] Falha ao iniciar serviço: {e}{Style.RESET_ALL}")
+        return
+
+    print(
+        f"{Fore.MAGENTA}=== MASHA CNPJ API em http://{args.host}:{args.port} ==={Style.RESET_ALL}\n"
+        f"{Fore.WHITE}DB: {args.db} | release: {release_id(args.db)}{Style.RESET_ALL}"
+    )
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}[i] Encerrando serviço...{Style.RESET_ALL}")
+    finally:
+        httpd.server_close()
+        httpd.RequestHandlerClass.service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import concurrent.futures
 from curl_cffi import requests
 from colorama import Fore, Style
 
+from src.utils.replay import ReplayMissError, replay_call
+
 SITES = {
     "Instagram": "https://www.instagram.com/{}",
     "Twitter": "https://twitter.com/{}",
@@ -18,9 +20,17 @@ SITES = {
 def _check(site, url_template, user):
     url = url_template.format(user)
     try:
-        r = requests.get(url, impersonate="chrome110", timeout=7)
-        if r.status_code == 200:
+        status = replay_call(
+            "sherlock",
+            {"url": url},
+            lambda: requests.get(url, impersonate="chrome110", timeout=7).status_code,
+        )
+        if status == 200:
             return {"platform": site, "url": url}
+    except ReplayMissError:
+        # Fixture faltando não é "perfil inexistente": o replay ficaria
+        # incompleto sem ninguém perceber
+        raise
     except:
         pass
     return None
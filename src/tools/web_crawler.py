@@ -7,6 +7,8 @@ import pdfplumber
 import pandas as pd
 from curl_cffi import requests
 
+from src.utils.replay import ReplayMissError, decode_bytes, encode_bytes, replay_call
+
 
 def _clean_text(t: str):
     return re.sub(r"\s+", " ", t).strip()
@@ -49,9 +51,26 @@ def _extract_phones(t: str):
     return sorted(phones)
 
 
+def _fetch(url: str):
+    """
+    GET com impersonate do Chrome. Retorna (status_code, content bytes, encoding),
+    passando pelo record/replay (src/utils/replay.py).
+    """
+    def _live():
+        resp = requests.get(url, impersonate="chrome110", timeout=15)
+        return {
+            "status_code": resp.status_code,
+            "encoding": resp.encoding,
+            "content": encode_bytes(resp.content),
+        }
+
+    data = replay_call("crawler", {"url": url}, _live)
+    return data["status_code"], decode_bytes(data["content"]), data.get("encoding")
+
+
 def _download(url: str) -> bytes:
-    resp = requests.get(url, impersonate="chrome110", timeout=15)
-    return resp.content if resp.status_code == 200 else b""
+    status, content, _ = _fetch(url)
+    return content if status == 200 else b""
 
 
 def _parse_pdf(content: bytes):
@@ -117,15 +136,16 @@ def extract_contacts(url: str):
             return out
 
         # HTML
-        resp = requests.get(url, impersonate="chrome110", timeout=15)
+        status, content, encoding = _fetch(url)
 
-        if resp.status_code == 403:
+        if status == 403:
             return {"error": "403 Firewall/Cloudflare"}
 
-        if resp.status_code != 200:
-            return {"error": f"HTTP {resp.status_code}"}
+        if status != 200:
+            return {"error": f"HTTP {status}"}
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+        html = content.decode(encoding or "utf-8", errors="replace")
+        soup = BeautifulSoup(html, "html.parser")
 
         for bad in soup(["script", "style", "noscript"]):
             bad.decompose()
@@ -150,5 +170,8 @@ def extract_contacts(url: str):
 
         return out
 
+    except ReplayMissError:
+        # Fixture faltando no replay não é falha de rede: aborta a execução
+        raise
     except Exception as e:
         return {"error": str(e)}
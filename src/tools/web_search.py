@@ -1,15 +1,27 @@
 import os
+import json
 import requests
 from typing import List, Dict, Any, Union
 from dotenv import load_dotenv
 from colorama import Fore, Style
 
+from src.utils.replay import ReplayMissError, replay_call, replay_enabled
+
 load_dotenv()
 
+
+def _serpapi_get(params: Dict[str, Any]) -> Dict[str, Any]:
+    response = requests.get("https://serpapi.com/search.json",
+                            params=params, timeout=20)
+    return {"status_code": response.status_code, "text": response.text}
+
+
 def search_google(query: str, num_results: int = 5,
                   country: str = "us", lang: str = "en") -> Union[List[Dict[str, Any]], Dict[str, str]]:
 
     api_key = os.getenv("SERPAPI_KEY")
+    if not api_key and replay_enabled():
+        api_key = "replay"
     if not api_key:
         return {"error": "CRITICAL: SERPAPI_KEY não encontrado no .env"}
 
@@ -25,13 +37,14 @@ def search_google(query: str, num_results: int = 5,
     }
 
     try:
-        response = requests.get("https://serpapi.com/search.json",
-                                params=params, timeout=20)
+        # Fixtures são indexadas sem a chave da API
+        request = {k: v for k, v in params.items() if k != "api_key"}
+        response = replay_call("serpapi", request, lambda: _serpapi_get(params))
 
-        if response.status_code != 200:
-            return {"error": f"HTTP {response.status_code}: {response.text}"}
+        if response["status_code"] != 200:
+            return {"error": f"HTTP {response['status_code']}: {response['text']}"}
 
-        data = response.json()
+        data = json.loads(response["text"])
         if "error" in data:
             return {"error": data["error"]}
 
@@ -47,5 +60,8 @@ def search_google(query: str, num_results: int = 5,
 
         return clean if clean else {"warning": "No results."}
 
+    except ReplayMissError:
+        # Fixture faltando no replay não é falha de rede: aborta a execução
+        raise
     except Exception as e:
         return {"error": f"Connection Failed: {str(e)}"}
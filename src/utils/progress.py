@@ -0,0 +1,173 @@
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from tqdm import tqdm
+
+try:
+    import resource  # não existe no Windows
+except ImportError:
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Pico de memória residente do processo (MB), ou None se indisponível.
+    ru_maxrss vem em KB no Linux e em bytes no macOS.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+class ImportProgress:
+    """
+    Telemetria de importação de UM arquivo (membro do ZIP):
+      - barra tqdm por bytes descompactados (com ETA)
+      - eventos estruturados em JSONL (um por linha)
+
+    Eventos: member_start, chunk, member_done, member_error.
+    Campos: bytes_read/bytes_total, rows_parsed (lidas do CSV),
+    rows_written (inseridas segundo o SQLite), rows_per_s, bytes_per_s,
+    eta_s, peak_rss_mb, parse_s/write_s (por chunk).
+    """
+
+    def __init__(
+        self,
+        log_path: Optional[str],
+        zip_path: str,
+        member: str,
+        table: str,
+        bytes_total: int,
+        show_bar: bool = True,
+    ) -> None:
+        self.log_path = log_path
+        self.base = {"zip": os.path.basename(zip_path), "member": member, "table": table}
+        self.bytes_total = bytes_total
+        self.bytes_read = 0
+        self.rows_parsed = 0
+        self.rows_written = 0
+        self.chunks = 0
+        self.start = time.perf_counter()
+        self._closed = False
+
+        self._log = None
+        if log_path:
+            log_dir = os.path.dirname(log_path)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            self._log = open(log_path, "a", encoding="utf-8")
+
+        self._bar = None
+        if show_bar:
+            self._bar = tqdm(
+                total=bytes_total or None,
+                unit="B",
+                unit_scale=True,
+                unit_divisor=1024,
+                desc=table,
+                leave=True,
+            )
+
+        self._emit("member_start")
+
+    # ---------------------- internos ----------------------
+    def _rates(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.start
+        bytes_per_s = self.bytes_read / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.bytes_total and bytes_per_s > 0:
+            eta = max(self.bytes_total - self.bytes_read, 0) / bytes_per_s
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "rows_per_s": round(self.rows_written / elapsed, 1) if elapsed > 0 else 0.0,
+            "bytes_per_s": round(bytes_per_s, 1),
+            "eta_s": round(eta, 1) if eta is not None else None,
+        }
+
+    def _emit(self, event: str, **extra: Any) -> None:
+        if not self._log:
+            return
+        record = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "event": event,
+            **self.base,
+            "bytes_read": self.bytes_read,
+            "bytes_total": self.bytes_total,
+            "rows_parsed": self.rows_parsed,
+            "rows_written": self.rows_written,
+            **self._rates(),
+            "peak_rss_mb": peak_rss_mb(),
+            **extra,
+        }
+        self._log.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._log.flush()
+
+    # ---------------------- API ----------------------
+    def chunk(
+        self,
+        rows_parsed: int,
+        rows_written: int,
+        bytes_read: int,
+        parse_s: float,
+        write_s: float,
+    ) -> None:
+        """
+        Registra um chunk. `bytes_read` é a posição ABSOLUTA no arquivo
+        descompactado (ex: ZipExtFile.tell()).
+        """
+        self.chunks += 1
+        self.rows_parsed += rows_parsed
+        self.rows_written += rows_written
+
+        advance = max(bytes_read - self.bytes_read, 0)
+        self.bytes_read = max(bytes_read, self.bytes_read)
+
+        if self._bar is not None:
+            self._bar.update(advance)
+            self._bar.set_postfix(
+                rows=str(self.rows_written),
+                rows_s=f"{self._rates()['rows_per_s']:.0f}",
+                rss_mb=peak_rss_mb(),
+                refresh=False,
+            )
+
+        self._emit(
+            "chunk",
+            chunk=self.chunks,
+            parse_s=round(parse_s, 3),
+            write_s=round(write_s, 3),
+        )
+
+    def close(self, error: Optional[str] = None) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        if error:
+            self._emit("member_error", error=error)
+        else:
+            # Ao final, o arquivo foi lido por inteiro
+            if self.bytes_total:
+                if self._bar is not None:
+                    self._bar.update(max(self.bytes_total - self.bytes_read, 0))
+                self.bytes_read = self.bytes_total
+            self._emit("member_done", chunks=self.chunks)
+
+        if self._bar is not None:
+            self._bar.close()
+        if self._log:
+            self._log.close()
+            self._log = None
+
+    def write(self, msg: str) -> None:
+        """Print que não quebra a barra do tqdm."""
+        if self._bar is not None:
+            tqdm.write(msg)
+        else:
+            print(msg)
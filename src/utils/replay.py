@@ -0,0 +1,127 @@
+import base64
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict
+
+# ============================================================
+#  RECORD / REPLAY DAS CHAMADAS EXTERNAS
+# ============================================================
+#
+# Controlado por variáveis de ambiente (lidas a cada chamada):
+#
+#   MASHA_REPLAY_MODE     off | record | replay   (padrão: off)
+#   MASHA_REPLAY_DIR      pasta das fixtures      (padrão: fixtures/replay)
+#   MASHA_REPLAY_LATENCY  latência sintética no replay:
+#                           "0"                          → sem espera
+#                           "250"                        → 250 ms em toda chamada
+#                           "deepseek=1500,serpapi=400"  → por tipo de chamada
+#                           "recorded"                   → a mesma medida na gravação
+#
+# Tipos de chamada: deepseek, serpapi, crawler, sherlock.
+# Cada fixture é um JSON em <dir>/<tipo>/<sha1 da requisição>.json.
+
+
+class ReplayMissError(KeyError):
+    """Não existe fixture gravada para a requisição (modo replay)."""
+
+
+def replay_mode() -> str:
+    return os.getenv("MASHA_REPLAY_MODE", "off").strip().lower()
+
+
+def replay_enabled() -> bool:
+    return replay_mode() == "replay"
+
+
+def _fixtures_dir() -> str:
+    return os.getenv("MASHA_REPLAY_DIR", os.path.join("fixtures", "replay"))
+
+
+def _fixture_path(kind: str, request: Dict[str, Any]) -> str:
+    key = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(_fixtures_dir(), kind, f"{digest}.json")
+
+
+def _synthetic_latency(kind: str, recorded_ms: float) -> float:
+    """
+    Retorna a latência (em segundos) a simular para um tipo de chamada.
+    """
+    spec = os.getenv("MASHA_REPLAY_LATENCY", "0").strip().lower()
+
+    if spec == "recorded":
+        return recorded_ms / 1000
+
+    if "=" not in spec:
+        try:
+            return float(spec) / 1000
+        except ValueError:
+            return 0.0
+
+    for item in spec.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() == kind:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                return 0.0
+    return 0.0
+
+
+def replay_call(kind: str, request: Dict[str, Any], live: Callable[[], Any]) -> Any:
+    """
+    Executa `live()` conforme o modo:
+      - off:    chama direto
+      - record: chama e grava {request, response, elapsed_ms}
+      - replay: devolve a resposta gravada (após a latência sintética),
+                sem rede; levanta ReplayMissError se não houver fixture.
+
+    `request` identifica a chamada (não inclua chaves de API).
+    `live()` deve retornar algo serializável em JSON.
+    """
+    mode = replay_mode()
+
+    if mode == "replay":
+        path = _fixture_path(kind, request)
+        if not os.path.isfile(path):
+            raise ReplayMissError(f"Sem fixture de {kind} para a requisição: {path}")
+        with open(path, "r", encoding="utf-8") as f:
+            fixture = json.load(f)
+        delay = _synthetic_latency(kind, fixture.get("elapsed_ms", 0))
+        if delay > 0:
+            time.sleep(delay)
+        return fixture["response"]
+
+    if mode != "record":
+        return live()
+
+    start = time.perf_counter()
+    response = live()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    path = _fixture_path(kind, request)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "kind": kind,
+                "request": request,
+                "response": response,
+                "elapsed_ms": round(elapsed_ms, 1),
+            },
+            f,
+            indent=2,
+            ensure_ascii=False,
+        )
+    return response
+
+
+def encode_bytes(content: bytes) -> str:
+    """Bytes → texto para caber na fixture JSON (ex: PDFs do crawler)."""
+    return base64.b64encode(content).decode("ascii")
+
+
+def decode_bytes(content: str) -> bytes:
+    return base64.b64decode(content.encode("ascii"))
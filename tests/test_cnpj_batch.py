@@ -0,0 +1,134 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.tools.cnpj_batch import _normalize_cnpj, enrich_cnpjs, read_cnpj_file, run_batch
+from src.tools.cnpj_db import ReadOnlyPool, lookup_cnpjs
+from src.tools.cnpj_loader import EMPRESAS_COLUMNS, SOCIOS_COLUMNS
+
+
+# ============================================================
+#  LEITURA DO ARQUIVO DE ENTRADA
+# ============================================================
+
+@pytest.mark.parametrize("header", ["cnpj", "documento"])
+def test_single_column_csv_keeps_header(tmp_path, header):
+    path = tmp_path / "fornecedores.csv"
+    path.write_text(f"{header}\n00.000.000/0001-91\n11222333000181\n", encoding="utf-8")
+
+    df, keys = read_cnpj_file(str(path))
+
+    assert list(df.columns) == [header]
+    assert keys["CNPJ"].tolist() == ["00000000000191", "11222333000181"]
+
+
+def test_single_column_csv_with_explicit_column(tmp_path):
+    path = tmp_path / "fornecedores.csv"
+    path.write_text("cnpj\n11.222.333/0001-81\n", encoding="utf-8")
+
+    _, keys = read_cnpj_file(str(path), column="cnpj")
+
+    assert keys["CNPJ_BASICO"].tolist() == ["11222333"]
+
+
+@pytest.mark.parametrize("sep", [";", ",", "|", "\t"])
+def test_multi_column_csv_separators(tmp_path, sep):
+    path = tmp_path / "fornecedores.csv"
+    path.write_text(
+        sep.join(["nome", "cnpj"]) + "\n" + sep.join(["BB", "00000000000191"]) + "\n",
+        encoding="utf-8",
+    )
+
+    df, keys = read_cnpj_file(str(path))
+
+    assert df["nome"].tolist() == ["BB"]
+    assert keys["CNPJ"].tolist() == ["00000000000191"]
+
+
+# ============================================================
+#  NORMALIZAÇÃO / VALIDAÇÃO DE CNPJ
+# ============================================================
+
+def test_cnpj_without_leading_zeros_is_restored():
+    # Banco do Brasil (00.000.000/0001-91) salvo como número na planilha
+    assert _normalize_cnpj("191") == "00000000000191"
+    assert _normalize_cnpj(191.0) == "00000000000191"
+
+
+def test_full_cnpj_with_bad_check_digits_is_invalid():
+    assert _normalize_cnpj("11.222.333/0001-81") == "11222333000181"
+    assert _normalize_cnpj("11.222.333/0001-80") == ""
+
+
+def test_short_numbers_are_not_basico_by_default():
+    assert _normalize_cnpj("12") == ""
+    assert _normalize_cnpj("12", accept_basico=True) == "00000012"
+
+
+def test_eight_digits_is_basico():
+    assert _normalize_cnpj("12345678") == "12345678"
+
+
+@pytest.mark.parametrize("value", [None, "", "abc", "000000000000000", "11111111111111"])
+def test_invalid_values(value):
+    assert _normalize_cnpj(value) == ""
+
+
+# ============================================================
+#  BASE COM IMPORTAÇÃO DUPLICADA
+# ============================================================
+
+@pytest.fixture
+def duplicated_db(tmp_path):
+    """cnpj.db com o mesmo ZIP importado duas vezes (o loader sempre faz append)."""
+    path = str(tmp_path / "cnpj.db")
+    empresa = dict.fromkeys(EMPRESAS_COLUMNS, "")
+    empresa.update(CNPJ_BASICO="11222333", RAZAO_SOCIAL="EMPRESA TESTE")
+    socios = [dict.fromkeys(SOCIOS_COLUMNS, "") for _ in range(2)]
+    for i, socio in enumerate(socios):
+        socio.update(CNPJ_BASICO="11222333", NOME_SOCIO_RAZAO_SOCIAL=f"SOCIO {i}")
+
+    conn = sqlite3.connect(path)
+    for _ in range(2):
+        pd.DataFrame([empresa]).to_sql("empresas", conn, if_exists="append", index=False)
+        pd.DataFrame(socios).to_sql("socios", conn, if_exists="append", index=False)
+    conn.close()
+
+    pool = ReadOnlyPool(db_path=path, size=1)
+    yield pool
+    pool.close()
+
+
+def test_enrich_returns_one_row_per_company(duplicated_db):
+    df = enrich_cnpjs(["11222333", "11222333", "99999999"], pool=duplicated_db)
+
+    assert sorted(df.index) == ["11222333", "99999999"]
+    assert df.loc["11222333", "RAZAO_SOCIAL"] == "EMPRESA TESTE"
+    assert df.loc["11222333", "QTD_SOCIOS"] == 2
+
+
+def test_lookup_cnpjs_does_not_repeat_socios(duplicated_db):
+    result = lookup_cnpjs(["11222333000181"], pool=duplicated_db)["11222333"]
+
+    assert result["empresa"]["RAZAO_SOCIAL"] == "EMPRESA TESTE"
+    assert len(result["socios"]) == 2
+
+
+def test_batch_keeps_input_columns_with_registry_names(duplicated_db, tmp_path):
+    path = tmp_path / "fornecedores.csv"
+    path.write_text(
+        "cnpj;RAZAO_SOCIAL;CNPJ_BASICO;RECEITA_RAZAO_SOCIAL\n"
+        "11.222.333/0001-81;Fornecedor X;abc;planilha\n",
+        encoding="utf-8",
+    )
+
+    result = run_batch(str(path), str(tmp_path / "out.csv"), silent=True, pool=duplicated_db)
+
+    row = result.iloc[0]
+    assert row["RAZAO_SOCIAL"] == "Fornecedor X"
+    assert row["CNPJ_BASICO"] == "abc"
+    assert row["RECEITA_RAZAO_SOCIAL"] == "planilha"
+    assert row["RECEITA_RAZAO_SOCIAL_2"] == "EMPRESA TESTE"
+    assert row["RECEITA_CNPJ_BASICO"] == "11222333"
+    assert bool(row["RECEITA_ENCONTRADO"])